@@ -4,9 +4,16 @@
 
 
 import datetime as dt
-from math import acos, asin, atan, atan2, cos, degrees, radians, sin, tan
+import functools
+from math import acos, asin, atan, atan2, cos, pi, sin, tan
 
-import julian
+
+# Conversion factors, identical to the ones used by math.radians/degrees
+_DEG_TO_RAD = pi / 180
+_RAD_TO_DEG = 180 / pi
+
+# The sun moves 15 degrees an hour, hence radians of hour angle to hours
+_RAD_TO_HOURS = _RAD_TO_DEG / 15
 
 
 ################################################# PRIVATE FUNCTIONS
@@ -16,18 +23,26 @@ def julianEquation(date):
     """
     Converts a Gregorian date to a Julian date.
 
+    The proleptic Gregorian ordinal of 0001-01-01 is 1, which falls on
+    Julian date 1721425.5, hence the constant offset below.
+
     :param date: datetime.datetime, representing the Gregorian date.
     :return: Number, the corresponding Julian date.
     """
-    return julian.to_jd(date)
+    seconds = date.hour*3600 + date.minute*60 + date.second + date.microsecond/1e6
+    return date.toordinal() + 1721424.5 + seconds/86400
 
 
+@functools.lru_cache(maxsize=512)
 def sunEquation(date):
     """
     Calculates the declination of the sun and the equation of time which are
     needed in prayer calculations. The equations below are approximations of
     the real values however with an error of 1 arc minute at worst in 2200.
 
+    The results only depend on the date, hence they are cached since every
+    prayer of the same day asks for them.
+
     Definitions:
         Equation of Time = Apparent Solar Time - Mean Solar Time
         Declination = The angle between the sun's rays and Earth's equator.
@@ -45,15 +60,18 @@ def sunEquation(date):
     """
     d = julianEquation(date) - 2451545.0
 
-    g = radians((357.529 + 0.98560028 * d) % 360)
-    q = radians((280.459 + 0.98564736 * d) % 360)
-    L = radians((degrees(q) + 1.915 * sin(g) + 0.020 * sin(2*g)))
+    g = ((357.529 + 0.98560028 * d) % 360) * _DEG_TO_RAD
+    q = (280.459 + 0.98564736 * d) % 360     # Only ever used in degrees
+    sinG, cosG = sin(g), cos(g)
+    L = (q + 1.915 * sinG + 0.020 * (2 * sinG * cosG)) * _DEG_TO_RAD
+    sinL, cosL = sin(L), cos(L)
 
-    e = radians((23.439 - 0.00000036 * d) % 360)
-    RA = degrees(atan2(cos(e) * sin(L), cos(L))) / 15
+    e = ((23.439 - 0.00000036 * d) % 360) * _DEG_TO_RAD
+    sinE, cosE = sin(e), cos(e)
+    RA = atan2(cosE * sinL, cosL) * _RAD_TO_DEG / 15
 
-    declination = degrees(asin(sin(e) * sin(L)))
-    equationOfTime = degrees(q)/15 - (RA % 24)
+    declination = asin(sinE * sinL) * _RAD_TO_DEG
+    equationOfTime = q/15 - (RA % 24)
     return declination, equationOfTime
 
 
@@ -69,12 +87,11 @@ def horizonEquation(angle, latitude, declination):
     :param declination: Number, the declination of the sun in degrees.
     :return: datetime.timedelta, the time taken for the sun to reach the angle.
     """
-    a = radians(angle)
-    LAT = radians(latitude)
-    DEC = radians(declination)
-
-    h = 1/15 * degrees(acos((-sin(a) - sin(LAT)*sin(DEC)) / (cos(LAT)*cos(DEC))))
-    return dt.timedelta(hours=h)
+    LAT = latitude * _DEG_TO_RAD
+    DEC = declination * _DEG_TO_RAD
+    sinANG = sin(angle * _DEG_TO_RAD)
+    hours = _hourAngleHours(-sinANG, sin(LAT)*sin(DEC), cos(LAT)*cos(DEC))
+    return dt.timedelta(hours=hours)
 
 
 def asrEquation(shadowLength, latitude, declination):
@@ -90,13 +107,99 @@ def asrEquation(shadowLength, latitude, declination):
     :return: datetime.timedelta, the time taken for an object's shadow to reach
     N times its length from when the sun is at its highest point (~thuhr).
     """
+    LAT = latitude * _DEG_TO_RAD
+    DEC = declination * _DEG_TO_RAD
+    sinALT = _asrAltitudeSine(shadowLength, LAT, DEC)
+    hours = _hourAngleHours(sinALT, sin(LAT)*sin(DEC), cos(LAT)*cos(DEC))
+    return dt.timedelta(hours=hours)
+
+
+def _hourAngleHours(sinAltitude, sinLATsinDEC, cosLATcosDEC):
+    """
+    The float kernel shared by the horizon and asr equations, both of which
+    compute the hour angle at which the sun reaches a given altitude.
+
+    The trigonometry of the latitude and declination is passed in already
+    evaluated, such that callers computing several prayers can share it.
+
+    :param sinAltitude: Number, the sine of the altitude of the sun.
+    :param sinLATsinDEC: Number, sin(latitude) * sin(declination).
+    :param cosLATcosDEC: Number, cos(latitude) * cos(declination).
+    :return: Number, the hour angle of the sun at the given altitude in hours.
+    """
+    return acos((sinAltitude - sinLATsinDEC) / cosLATcosDEC) * _RAD_TO_HOURS
+
+
+def _asrAltitudeSine(shadowLength, LAT, DEC):
+    """
+    Computes the sine of the altitude of the sun at which the shadow of an
+    object is N times its length plus its shadow at its highest point (~thuhr).
+
+    :param shadowLength: Number, the multiplier for the length of an object's shadow.
+    :param LAT: Number, the latitude of the point of interest in radians.
+    :param DEC: Number, the declination of the sun in radians.
+    :return: Number, the sine of the altitude of the sun.
+    """
+    return sin(atan(1 / (shadowLength + tan(LAT - DEC))))
+
+
+def latitudeTrig(latitude):
+    """
+    Computes the trigonometry of the latitude, which is fixed for a location
+    and hence only computed once per location evaluated by the specialised
+    equations below.
+
+    :param latitude: Number, the latitude of the point of interest in degrees.
+    :return: 3-Tuple, (latitude in radians, sin of latitude, cos of latitude)
+    """
+    LAT = latitude * _DEG_TO_RAD
+    return LAT, sin(LAT), cos(LAT)
+
+
+def specialiseHorizonAngles(angles):
+    """
+    Partially evaluates the horizon equation for several fixed angles (e.g.
+    fajr, maghrib and isha of a convention), leaving both the location and
+    the date free. Besides the sines of the angles being computed once however
+    many locations are evaluated, the trigonometry of the declination is
+    shared between all the angles.
+
+    :param angles: List, the angles the sun should reach below the horizon in degrees.
+    :return: function, mapping the latitudeTrig of the point of interest and
+    the declination of the sun in degrees to a list of the time taken for the
+    sun to reach each angle in hours.
+    """
+    sinAs = tuple(sin(angle * _DEG_TO_RAD) for angle in angles)
+
+    def horizonHours(trigLAT, declination):
+        _, sinLAT, cosLAT = trigLAT
+        DEC = declination * _DEG_TO_RAD
+        sinLATsinDEC, cosLATcosDEC = sinLAT*sin(DEC), cosLAT*cos(DEC)
+        return [_hourAngleHours(-sinA, sinLATsinDEC, cosLATcosDEC) for sinA in sinAs]
+
+    return horizonHours
+
+
+def specialiseAsrShadow(shadowLength):
+    """
+    Partially evaluates the asr equation for a fixed shadow length (i.e. the
+    convention), leaving both the location and the date free.
+
+    :param shadowLength: Number, the multiplier for the length of an object's shadow.
+    :return: function, mapping the latitudeTrig of the point of interest and
+    the declination of the sun in degrees to the time taken for an object's
+    shadow to reach N times its length from when the sun is at its highest
+    point (~thuhr) in hours.
+    """
     SHA = shadowLength
-    LAT = radians(latitude)
-    DEC = radians(declination)
 
-    acot = lambda x: atan(1/x)
-    h = 1/15 * degrees(acos((sin(acot(SHA + tan(LAT - DEC))) - sin(LAT)*sin(DEC)) / (cos(LAT)*cos(DEC))))
-    return dt.timedelta(hours=h)
+    def asrHours(trigLAT, declination):
+        LAT, sinLAT, cosLAT = trigLAT
+        DEC = declination * _DEG_TO_RAD
+        sinALT = _asrAltitudeSine(SHA, LAT, DEC)
+        return _hourAngleHours(sinALT, sinLAT*sin(DEC), cosLAT*cos(DEC))
+
+    return asrHours
 
 
 ################################################# NUMERICAL FUNCTIONS
@@ -109,87 +212,9 @@ def computeDiff(p1, p2):
     :param p2: datetime.datetime, the second prayer.
     :return: 3-Tuple, (hours, minutes, seconds)
     """
-    if p2 > p1:
-        diff = p2 - p1
-    else:
-        diff = p1 - p2
+    diff = abs(p2 - p1)
 
-    hours, remainder = divmod(diff.total_seconds(), 3600)
+    # Integer arithmetic only, the microseconds are truncated anyway
+    hours, remainder = divmod(diff.days*86400 + diff.seconds, 3600)
     minutes, seconds = divmod(remainder, 60)
-
-    hours = int(hours)
-    minutes = int(minutes)
-    seconds = int(seconds)
     return hours, minutes, seconds
-
-# def __guessKhobarCoordinates():
-#     """
-#     Attempts to find the coordinates for my hometown in Khobar.
-#
-#     NOTE: This function is only for personal use and has hardcoded values.
-#     """
-#     timezone = 3
-#     fajrIshaConvention = "umm_alqura"
-#     asrConvention = "standard"
-#     coord = longitude, latitude = 50.0000, 26.6000
-#
-#     FORMAT = "%Y-%m-%d %H:%M"
-#     date = dt.datetime(2019, 1, 27)
-#     fajr = dt.datetime.strptime("2019-01-27 05:03", FORMAT)
-#     thuhr = dt.datetime.strptime("2019-01-27 11:53", FORMAT)
-#     asr = dt.datetime.strptime("2019-01-27 14:57", FORMAT)
-#     maghrib = dt.datetime.strptime("2019-01-27 17:19", FORMAT)
-#     isha = dt.datetime.strptime("2019-01-27 18:49", FORMAT)
-#     prayers = [fajr, thuhr, asr, maghrib, isha]
-#
-#     longitudeRange = [longitude-2, longitude+2]
-#     latitudeRange = [latitude-2, latitude+2]
-#
-#     longitude, latitude, err = \
-#         guessCoordinates(prayers,
-#                          longitudeRange, latitudeRange,
-#                          date, timezone, fajrIshaConvention, asrConvention)
-#     print("Khobar Coordinates: LON={}, LAT={}, ERR={}".format(longitude, latitude, err))
-#
-#
-# def guessCoordinates(prayers,
-#                      longitudeRange, latitudeRange,
-#                      date, timezone, fajrIshaConvention, asrConvention,
-#                      guesses=10000):
-#     """
-#     This function brute forces numerically the actual latitude and longitude
-#     coordinates for the given prayer times.
-#
-#     Randomly generates latitude and longitude coordinates within a given
-#     range of values, then computes the corresponding prayer times, and then
-#     finds the error between these prayer times and the actual prayer times.
-#
-#     :param prayers: 5-List, [fajr, thuhr, asr, maghrib, isha].
-#     :param longitudeRange: 2-List, [startLonGuess, endLonGuess].
-#     :param latitudeRange: 2-List, [startLatGuess, endLatGuess].
-#     :param date: datetime.datetime, representing the Gregorian date.
-#     :param timezone: Number, the timezone of the point of interest in hours.
-#     :param fajrIshaConvention: String, the angle convention (see dictionary below).
-#     :param asrConvention: String, the shadow length multiplier (see dictionary below).
-#     :param guesses: Number, the amount of iterations to try.
-#     :return: 3-Tuple, (lowestCumulativeErrorInMinutes, guessLat, guessLon).
-#     """
-#     points = {}
-#
-#     for i in range(guesses):
-#         longitude = random.uniform(*longitudeRange)
-#         latitude = random.uniform(*latitudeRange)
-#         coord = (longitude, latitude)
-#
-#         ps = computePrayerTimes(date, coord, timezone, fajrIshaConvention, asrConvention)
-#         ps = [prayer for name, prayer in ps.items()]
-#
-#         errorFunction = lambda hour, min, sec: 60*hour + min + sec/60
-#         err = [errorFunction(*computeDiff(p1, p2)) for p1, p2 in zip(prayers, ps)]
-#         err = sum(err)
-#         points[err] = (longitude, latitude)
-#
-#     err, (longitude, latitude) = sorted(points.items(), reverse=True).pop()
-#     return longitude, latitude, err
-#
-#
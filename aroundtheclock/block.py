@@ -5,12 +5,16 @@
 import functools
 import logging
 import logging.config
-import shlex
+import socket
+import struct
 import subprocess
 
 import schedule
 
 
+PATH_ROUTE = "/proc/net/route"
+
+
 def oneTimeJob(func):
     """
     Decorator that causes the given scheduled function to run only once.
@@ -49,21 +53,31 @@ def blockInternet(duration):
     """
     # Fetch network parameters from OS for arp spoofing
     try:
-        # Send output to PIPE to store in buffer
-        cmdRoute = "ip route"
-        p1 = subprocess.run(shlex.split(cmdRoute), stdout=subprocess.PIPE)
-        GATEWAY = p1.stdout.split()[2].decode("ascii")
-        INTERFACE = p1.stdout.split()[4].decode("ascii")
+        # Read the kernel's routing table directly rather than forking 'ip route'.
+        # The default route is the one with destination and mask 00000000, where
+        # the gateway is a little-endian hex IPv4 address, e.g. 0202000A = 10.0.2.2
+        with open(PATH_ROUTE, "r") as f:
+            routes = [line.split() for line in f.read().splitlines()[1:]]
+        INTERFACE, gateway = next((r[0], r[2]) for r in routes
+                                  if r[1] == "00000000" and r[7] == "00000000")
+        GATEWAY = socket.inet_ntoa(struct.pack("<L", int(gateway, 16)))
         logging.info("Found GW={}, INT={}".format(GATEWAY, INTERFACE))
-    except IndexError:
-        logging.exception("The output of 'ip route' is empty! It looks like"
-                          "The OS networking service might need a restart!")
-        raise OSError("'ip route' failed to return output!")
+    except (OSError, StopIteration, ValueError, IndexError):
+        logging.exception("No default route found in {}! It looks like the OS "
+                          "networking service might need a restart!".format(PATH_ROUTE))
+        raise OSError("Failed to find the default route!")
 
     # Arp spoof entire network for a limited duration
     logging.info("Blocking internet for {} minute(s)!".format(duration))
     seconds = int(duration * 60)
-    cmdBlock = "sudo aroundtheclock {} {} {}".format(INTERFACE, GATEWAY, seconds)
-    logging.info("Ran the following command to block: '{}'".format(cmdBlock))
-    subprocess.run(shlex.split(cmdBlock))
-    logging.info("Block time over, unblocking internet now!")
+    cmdBlock = ["sudo", "aroundtheclock", INTERFACE, GATEWAY, str(seconds)]
+    logging.info("Ran the following command to block: '{}'".format(" ".join(cmdBlock)))
+
+    # The output is never read, hence discarded, however errors are left to
+    # reach the logs (e.g. a missing sudoers entry or a missing arpspoof)
+    p = subprocess.run(cmdBlock, stdout=subprocess.DEVNULL)
+    if p.returncode != 0:
+        logging.error("Failed to block internet, the command exited with code {}!"
+                      .format(p.returncode))
+    else:
+        logging.info("Block time over, unblocking internet now!")
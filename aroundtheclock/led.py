@@ -3,11 +3,17 @@
 """
 
 
+import logging
+import threading
 import time
 
 import RPi.GPIO as GPIO
 
 
+# Duty cycle percentages stepped through by a single blink (0% -> 100% -> 0%)
+_RAMP = tuple(range(0, 100)) + tuple(range(100, 0, -1))
+
+
 def initialisePi(pin: int):
     """
     Initialises the PIN to be connected to the LED.
@@ -33,19 +39,45 @@ def blinkLED(pin, speed: int):
     :param pin: RPi.GPIO.PWM, representing the pin connected to the LED.
     :param speed: The number of seconds the LED takes to blink fully.
     """
-    INTERVAL = 1
-    MIN_PERCENT = 0
-    MAX_PERCENT = 100
-    STEPS = (MAX_PERCENT - MIN_PERCENT) / INTERVAL
-    DUTY_DELAY = speed / (2 * STEPS)
+    DUTY_DELAY = speed / len(_RAMP)
+
+    # Bound to locals since the ramp runs continuously while the LED is in use
+    sleep = time.sleep
+    changeDutyCycle = pin.ChangeDutyCycle
+
+    for percentage in _RAMP:
+        changeDutyCycle(percentage)
+        sleep(DUTY_DELAY)
+
+
+def blinkContinuously(pin, speed):
+    """
+    Blinks the LED repeatedly for the lifetime of the process.
 
-    for percentage in range(MIN_PERCENT, MAX_PERCENT, INTERVAL):
-        pin.ChangeDutyCycle(percentage)
-        time.sleep(DUTY_DELAY)
+    A failed blink is logged and the next one attempted, since the thread
+    dying would otherwise leave the LED dark without anyone noticing.
 
-    for percentage in range(MAX_PERCENT, MIN_PERCENT, -INTERVAL):
-        pin.ChangeDutyCycle(percentage)
-        time.sleep(DUTY_DELAY)
+    :param pin: RPi.GPIO.PWM, representing the pin connected to the LED.
+    :param speed: function, returning the number of seconds the next blink takes.
+    """
+    while True:
+        try:
+            blinkLED(pin, speed())
+        except Exception:
+            logging.exception("Failed to blink the LED!")
+            time.sleep(1)
+
+
+def startBlinking(pin, speed):
+    """
+    Blinks the LED on a background daemon thread so that the caller is not
+    stalled by the duty cycle ramp (e.g. it can run scheduled jobs on time).
+
+    :param pin: RPi.GPIO.PWM, representing the pin connected to the LED.
+    :param speed: function, returning the number of seconds the next blink takes.
+    """
+    thread = threading.Thread(target=blinkContinuously, args=(pin, speed), daemon=True)
+    thread.start()
 
 
 def main():
@@ -6,6 +6,7 @@
 import json
 import logging
 import logging.config
+import time
 from pathlib import Path
 
 import schedule
@@ -24,17 +25,62 @@
 PATH_ROOT = Path(__file__, "../../").absolute().resolve()
 
 
+def readConfig(path):
+    """
+    Reads the config file, coercing the location parameters to numbers once.
+    The coercion keeps older config files, which stored them as strings, working.
+
+    :param path: Path, the JSON config file to read.
+    :return: Dictionary, the parsed config.
+    """
+    with open(path.as_posix(), "r") as f:
+        config = json.load(f)
+
+    for key in ["longitude", "latitude", "timezone"]:
+        config[key] = float(config[key])
+    return config
+
+
+def computeBlinkSpeed():
+    """
+    Computes how long a single LED blink should take, such that the LED blinks
+    faster as the next scheduled job approaches.
+
+    :return: Number, the seconds a blink takes, being the hours left until the
+    next job (at least 0.5).
+    """
+    # Read once, since the main thread may cancel jobs (e.g. the last one)
+    # while this runs on the LED thread
+    nextRun = schedule.default_scheduler.next_run
+    if not nextRun:
+        return 0.5
+
+    blinkSpeed = nextRun - dt.datetime.now()
+    blinkSpeed = blinkSpeed.total_seconds() / 3600
+    return max(blinkSpeed, 0.5)
+
+
+def computeSleepDuration():
+    """
+    Computes how long the scheduler can sleep before the next job is due. It
+    still wakes up at least once a minute in case the system clock jumps (e.g.
+    a Raspberry Pi has no RTC and syncs its clock over NTP after booting).
+
+    :return: Number, the seconds to sleep.
+    """
+    if not schedule.default_scheduler.next_run:
+        return 0
+
+    return min(max(schedule.idle_seconds(), 0), 60)
+
+
 def main():
     """
     Runs the script.
     """
     # Reading config file
     PATH_CONFIG = Path(PATH_ROOT, "config/config.json").absolute().resolve()
-    with open(PATH_CONFIG.as_posix(), "r") as f:
-        CONFIG = json.load(f)
-        CONFIG["longitude"] = float(CONFIG["longitude"])
-        CONFIG["latitude"] = float(CONFIG["latitude"])
-        CONFIG["timezone"] = int(CONFIG["timezone"])
+    CONFIG = readConfig(PATH_CONFIG)
 
     # Creating output directory
     PATH_OUT = Path(CONFIG["path"]["output"])
@@ -49,42 +95,42 @@ def main():
     if led:
         logging.info("Initialising Raspberry Pi pin: {}".format(CONFIG["pin"]))
         pin = led.initialisePi(CONFIG["pin"])
+        led.startBlinking(pin, computeBlinkSpeed)
 
     ######################################## SCHEDULING
 
+    # Invariant for the lifetime of the daemon, hence not rebuilt every day
+    args = [(CONFIG["longitude"], CONFIG["latitude"]),
+            CONFIG["timezone"],
+            CONFIG["fajr_isha"],
+            CONFIG["asr"]]
+    PATH_PRAYER = Path(CONFIG["path"]["prayer"])
+
     # Schedule blocking times for prayers otherwise wait on existing jobs.
     while True:
         if schedule.default_scheduler.next_run:
-
-            if led:
-                blinkSpeed = schedule.default_scheduler.next_run - dt.datetime.now()
-                blinkSpeed = blinkSpeed.total_seconds() / 3600
-                if blinkSpeed < 0.5:
-                    blinkSpeed = 0.5
-                led.blinkLED(pin, blinkSpeed)
-
             schedule.run_pending()
+            time.sleep(computeSleepDuration())
         else:
-            FORMAT_SCHEDULE = "%H:%M"
-            FORMAT_PRINT = "%Y-%m-%d %H:%M"
-
             # Computing prayer times
             logger.info("Computing next five prayers after {}!".format(dt.date.today()))
-            prayers = nextFivePrayers((CONFIG["longitude"], CONFIG["latitude"]),
-                                      CONFIG["timezone"],
-                                      CONFIG["fajr_isha"],
-                                      CONFIG["asr"])
+            prayers = nextFivePrayers(*args)
 
             # Logging prayer times computed
-            ps = ["{}: {}".format(p, t.strftime(FORMAT_PRINT)) for p, t in prayers.items()]
+            ps = ["{}: {}".format(p, t.isoformat(" ", "minutes")) for p, t in prayers.items()]
             timings = ", ".join(ps)
             logger.info("Prayer times generated: {}.".format(timings))
-            writePrayerTimes(prayers, Path(CONFIG["path"]["prayer"]))
+            writePrayerTimes(prayers, PATH_PRAYER)
             printPrayerTimes(prayers)
 
-            # Scheduling prayer block times as jobs
+            # Scheduling prayer block times as jobs. Jobs are scheduled to the
+            # minute, so a prayer whose minute has already begun would be
+            # scheduled a day late instead, hence it is skipped.
+            NOW = dt.datetime.now().replace(second=0, microsecond=0)
             for p, t in prayers.items():
-                t = t.strftime(FORMAT_SCHEDULE)
+                if t.replace(second=0, microsecond=0) <= NOW:
+                    continue
+                t = t.time().isoformat("minutes")
                 duration = CONFIG["block"][p]
                 schedule.every().day.at(t).do(blockInternet, duration)
 
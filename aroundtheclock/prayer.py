@@ -27,37 +27,62 @@
 
 import datetime as dt
 import json
-from collections import OrderedDict
+import random
+from array import array
 
-from algorithms import asrEquation, horizonEquation, sunEquation
+from algorithms import (asrEquation, horizonEquation, latitudeTrig, specialiseAsrShadow,
+                        specialiseHorizonAngles, sunEquation)
+
+
+# Angles (in degrees) of the sun below the horizon at fajr and isha for each
+# convention, where "90min" means isha is 90 minutes after maghrib instead.
+FAJR_ISHA_ANGLE = {
+    "muslim_league": (18, 17),
+    "isna": (15, 15),
+    "egypt": (19.5, 17.5),
+    "umm_alqura": (18.5, "90min")
+}
+
+# Multiplier of an object's shadow length at asr for each convention.
+ASR_SHADOW = {
+    "standard": 1,
+    "hanafi": 2
+}
+
+# Angle (in degrees) of the sun below the horizon at maghrib (i.e. sunset),
+# accounting for the radius of the sun and atmospheric refraction.
+MAGHRIB_ANGLE = 0.833
+
+# Hours after maghrib that isha is at for the "90min" convention.
+ISHA_AFTER_MAGHRIB = 1.5
+
+# Names of the prayers in the order they are computed in.
+PRAYER_NAMES = ("fajr", "thuhr", "asr", "maghrib", "isha")
 
 
 def writePrayerTimes(prayers, PATH_OUT):
     """
     Writes the prayer times for each prayer into a file in JSON format.
 
-    :param prayers: OrderedDictionary, mapping prayer names to prayer times (datetime objects).
+    :param prayers: Dictionary, mapping prayer names to prayer times (datetime objects).
     :param PATH_OUT: Path, the output file to write to.
     """
-    DATETIME_FORMAT = "%H:%M"
-
-    prayers = [(p, t.strftime(DATETIME_FORMAT)) for p, t in prayers.items()]
-    prayers = OrderedDict(prayers)
+    prayers = {p: t.time().isoformat("minutes") for p, t in prayers.items()}
+    # Serialised upfront so that the file is written in a single call
     with open(PATH_OUT.as_posix(), 'w+') as f:
-        json.dump(prayers, f, indent=4)
+        f.write(json.dumps(prayers, indent=4))
 
 
 def printPrayerTimes(prayers):
     """
     Prints the prayer times in a neat table.
 
-    :param prayers: OrderedDictionary, mapping prayer names to prayer times
+    :param prayers: Dictionary, mapping prayer names to prayer times
     (datetime objects).
     """
     print("Prayer Times:")
-    PRINT_FORMAT = "%Y-%m-%d %H:%M"
     for prayer, time in prayers.items():
-        print("{:<8}: {}".format(prayer, time.strftime(PRINT_FORMAT)))
+        print("{:<8}: {}".format(prayer, time.isoformat(" ", "minutes")))
 
 
 def computePrayerTimes(date, coordinates, timezone, fajrIshaConvention, asrConvention):
@@ -67,40 +92,193 @@ def computePrayerTimes(date, coordinates, timezone, fajrIshaConvention, asrConve
     :param date: datetime.datetime, representing the Gregorian date.
     :param coordinates: 2-Tuple, (longitude, latitude) of the point of interest in degrees.
     :param timezone: Number, the timezone of the point of interest in hours.
-    :param fajrIshaConvention: String, the angle convention (see dictionary below).
-    :param asrConvention: String, the shadow length multiplier (see dictionary below).
-    :return: OrderedDictionary, mapping prayer names to prayer times (datetime objects).
+    :param fajrIshaConvention: String, the angle convention (see FAJR_ISHA_ANGLE).
+    :param asrConvention: String, the shadow length multiplier (see ASR_SHADOW).
+    :return: Dictionary, mapping prayer names to prayer times (datetime objects).
+    """
+    args = [coordinates, timezone, fajrIshaConvention, asrConvention]
+    return specialisePrayerTimes(*args)(date)
+
+
+def specialisePrayerTimes(coordinates, timezone, fajrIshaConvention, asrConvention):
+    """
+    Partially evaluates computePrayerTimes for a fixed location and fixed
+    conventions (as is the case for the lifetime of the daemon), such that
+    the convention lookups and the latitude trigonometry are done only once
+    rather than for every day computed.
+
+    :param coordinates: 2-Tuple, (longitude, latitude) of the point of interest in degrees.
+    :param timezone: Number, the timezone of the point of interest in hours.
+    :param fajrIshaConvention: String, the angle convention (see FAJR_ISHA_ANGLE).
+    :param asrConvention: String, the shadow length multiplier (see ASR_SHADOW).
+    :return: function, mapping a date (datetime.datetime) to a Dictionary
+    of prayer names to prayer times (datetime objects).
     """
-    PRAYER_NAMES = ["fajr", "thuhr", "asr", "maghrib", "isha"]
+    prayerHours = specialisePrayerHours(coordinates, timezone, fajrIshaConvention, asrConvention)
+
+    def prayerTimes(date):
+        times = [date + dt.timedelta(hours=h) for h in prayerHours(date)]
+        return dict(zip(PRAYER_NAMES, times))
 
-    fajrIshaAngle = {
-        "muslim_league": (18, 17),
-        "isna": (15, 15),
-        "egypt": (19.5, 17.5),
-        "umm_alqura": (18.5, "90min")
-    }
+    return prayerTimes
 
-    asrShadow = {
-        "standard": 1,
-        "hanafi": 2
-    }
 
-    TZ = timezone
+def specialisePrayerHours(coordinates, timezone, fajrIshaConvention, asrConvention):
+    """
+    The float kernel of specialisePrayerTimes, which works in hours after
+    midnight so that no datetime objects are built until a prayer time is
+    actually needed.
+
+    :param coordinates: 2-Tuple, (longitude, latitude) of the point of interest in degrees.
+    :param timezone: Number, the timezone of the point of interest in hours.
+    :param fajrIshaConvention: String, the angle convention (see FAJR_ISHA_ANGLE).
+    :param asrConvention: String, the shadow length multiplier (see ASR_SHADOW).
+    :return: function, mapping a date (datetime.datetime) to a 5-List of the
+    prayer times in hours after midnight, [fajr, thuhr, asr, maghrib, isha].
+    """
     LON, LAT = coordinates
-    F_ANG, I_ANG = fajrIshaAngle[fajrIshaConvention]
-    shadowLength = asrShadow[asrConvention]
+    conventionHours = specialiseConventionHours(timezone, fajrIshaConvention, asrConvention)
+
+    # Only the sun equation changes from day to day
+    longitudeHours = LON/15
+    trigLAT = latitudeTrig(LAT)
+
+    def prayerHours(date):
+        declination, equationOfTime = sunEquation(date)
+        return conventionHours(longitudeHours, trigLAT, declination, equationOfTime)
+
+    return prayerHours
 
-    thuhr = computeThuhr(date, LON, TZ)
-    fajr = computeFajr(date, F_ANG, LAT, thuhr)
-    asr = computeAsr(date, shadowLength, LAT, thuhr)
-    maghrib = computeMaghrib(date, LAT, thuhr)
 
+def specialiseConventionHours(timezone, fajrIshaConvention, asrConvention):
+    """
+    Partially evaluates the prayer times for a fixed timezone and fixed
+    conventions, leaving both the location and the date free. The convention
+    lookups and the trigonometry of the angles are therefore done once however
+    many locations are evaluated (e.g. the guesses of guessCoordinates).
+
+    :param timezone: Number, the timezone of the point of interest in hours.
+    :param fajrIshaConvention: String, the angle convention (see FAJR_ISHA_ANGLE).
+    :param asrConvention: String, the shadow length multiplier (see ASR_SHADOW).
+    :return: function, mapping the longitude of the point of interest / 15,
+    the latitudeTrig of the point of interest, the declination and the equation
+    of time (see sunEquation) to a 5-List of the prayer times in hours after
+    midnight, [fajr, thuhr, asr, maghrib, isha].
+    """
+    F_ANG, I_ANG = FAJR_ISHA_ANGLE[fajrIshaConvention]
+    shadowLength = ASR_SHADOW[asrConvention]
+    noon = 12 + timezone
+
+    # Fajr, maghrib and isha share the same horizon equation, hence they are
+    # evaluated together (isha only when it is defined by an angle)
+    if I_ANG == "90min":
+        horizonAngles = [F_ANG, MAGHRIB_ANGLE]
+    else:
+        horizonAngles = [F_ANG, MAGHRIB_ANGLE, I_ANG]
+    horizonOffsets = specialiseHorizonAngles(horizonAngles)
+    asrOffset = specialiseAsrShadow(shadowLength)
+
+    # The isha convention is fixed, hence it is chosen once rather than every call
     if I_ANG == "90min":
-        isha = computeIshaUmmAlQura(maghrib)
+        ishaHours = lambda thuhr, maghrib, offsets: maghrib + ISHA_AFTER_MAGHRIB
     else:
-        isha = computeIsha(date, I_ANG, LAT, thuhr)
+        ishaHours = lambda thuhr, maghrib, offsets: thuhr + offsets[2]
 
-    return OrderedDict(zip(PRAYER_NAMES, [fajr, thuhr, asr, maghrib, isha]))
+    def prayerHours(longitudeHours, trigLAT, declination, equationOfTime):
+        offsets = horizonOffsets(trigLAT, declination)
+
+        thuhr = _thuhrHours(noon, longitudeHours, equationOfTime)
+        fajr = thuhr - offsets[0]
+        asr = thuhr + asrOffset(trigLAT, declination)
+        maghrib = thuhr + offsets[1]
+        isha = ishaHours(thuhr, maghrib, offsets)
+
+        return [fajr, thuhr, asr, maghrib, isha]
+
+    return prayerHours
+
+
+def _thuhrHours(noon, longitudeHours, equationOfTime):
+    """
+    The float kernel of computeThuhr, shared with specialisePrayerHours.
+
+    Both terms fixed by the location are taken already evaluated, such that
+    specialisePrayerHours computes them once rather than every day.
+
+    :param noon: Number, 12 + the timezone of the point of interest in hours.
+    :param longitudeHours: Number, the longitude of the point of interest / 15.
+    :param equationOfTime: Number, the equation of time of the day in hours.
+    :return: Number, the time of Thuhr prayer in hours after midnight.
+    """
+    return noon - (longitudeHours + equationOfTime)
+
+
+def computePrayerTimesRange(date, days, coordinates, timezone, fajrIshaConvention, asrConvention):
+    """
+    Calculates the prayer time for all prayers over consecutive days (e.g. a
+    yearly timetable), specialising the computation for the location once
+    rather than once per day.
+
+    :param date: datetime.datetime, representing the Gregorian date of the first day.
+    :param days: Integer, the number of consecutive days to compute.
+    :param coordinates: 2-Tuple, (longitude, latitude) of the point of interest in degrees.
+    :param timezone: Number, the timezone of the point of interest in hours.
+    :param fajrIshaConvention: String, the angle convention (see FAJR_ISHA_ANGLE).
+    :param asrConvention: String, the shadow length multiplier (see ASR_SHADOW).
+    :return: List, of Dictionaries mapping prayer names to prayer times
+    (datetime objects), one per day.
+    """
+    args = [coordinates, timezone, fajrIshaConvention, asrConvention]
+    prayerTimes = specialisePrayerTimes(*args)
+    return [prayerTimes(date + dt.timedelta(days=i)) for i in range(days)]
+
+
+def guessCoordinates(prayers,
+                     longitudeRange, latitudeRange,
+                     date, timezone, fajrIshaConvention, asrConvention,
+                     guesses=10000, seed=None):
+    """
+    This function brute forces numerically the actual latitude and longitude
+    coordinates for the given prayer times.
+
+    Randomly generates latitude and longitude coordinates within a given
+    range of values, then computes the corresponding prayer times, and then
+    finds the error between these prayer times and the actual prayer times.
+
+    All guesses are compared in hours after midnight, hence no datetime
+    objects are built per guess. The conventions and the sun equation (which
+    only depends on the date) are evaluated once for all of them, leaving only
+    the trigonometry of each guessed latitude to compute per guess.
+
+    :param prayers: 5-List, [fajr, thuhr, asr, maghrib, isha] (datetime objects).
+    :param longitudeRange: 2-List, [startLonGuess, endLonGuess].
+    :param latitudeRange: 2-List, [startLatGuess, endLatGuess].
+    :param date: datetime.datetime, representing the Gregorian date.
+    :param timezone: Number, the timezone of the point of interest in hours.
+    :param fajrIshaConvention: String, the angle convention (see FAJR_ISHA_ANGLE).
+    :param asrConvention: String, the shadow length multiplier (see ASR_SHADOW).
+    :param guesses: Number, the amount of iterations to try.
+    :param seed: Number, seeds the random guesses to make them reproducible.
+    :return: 3-Tuple, (guessLon, guessLat, lowestCumulativeErrorInMinutes).
+    """
+    targets = [(p - date).total_seconds() / 3600 for p in prayers]
+
+    # Guesses are stored as flat arrays of doubles rather than as a tuple each.
+    # A local generator avoids disturbing (and looking up) the global one.
+    uniform = random.Random(seed).uniform
+    longitudes = array("d", (uniform(*longitudeRange) for _ in range(guesses)))
+    latitudes = array("d", (uniform(*latitudeRange) for _ in range(guesses)))
+
+    prayerHours = specialiseConventionHours(timezone, fajrIshaConvention, asrConvention)
+    declination, equationOfTime = sunEquation(date)
+
+    errors = array("d")
+    for longitude, latitude in zip(longitudes, latitudes):
+        hours = prayerHours(longitude/15, latitudeTrig(latitude), declination, equationOfTime)
+        errors.append(60 * sum(abs(h - t) for h, t in zip(hours, targets)))
+
+    i = min(range(guesses), key=errors.__getitem__)
+    return longitudes[i], latitudes[i], errors[i]
 
 
 def computeFajr(date, angle, latitude, thuhr):
@@ -128,7 +306,7 @@ def computeThuhr(date, longitude, timeZone):
     :return: datetime.datetime, the time of Thuhr prayer.
     """
     _, equationOfTime = sunEquation(date)
-    t = 12 + timeZone - (longitude/15 + equationOfTime)
+    t = _thuhrHours(12 + timeZone, longitude/15, equationOfTime)
     thuhr = date + dt.timedelta(hours=t)
     return thuhr
 
@@ -148,7 +326,7 @@ def computeAsr(date, shadowLength, latitude, thuhr):
     return asr
 
 
-def computeMaghrib(date, latitude, thuhr, angle=0.833):
+def computeMaghrib(date, latitude, thuhr, angle=MAGHRIB_ANGLE):
     """
     Calculates the time of Maghrib prayer.
 
@@ -185,7 +363,7 @@ def computeIshaUmmAlQura(maghrib):
     :param maghrib: datetime.datetime, the time of Maghrib prayer.
     :return: datetime.datetime, the time of Thuhr prayer.
     """
-    isha = maghrib + dt.timedelta(minutes=90)
+    isha = maghrib + dt.timedelta(hours=ISHA_AFTER_MAGHRIB)
     return isha
 
 
@@ -195,26 +373,19 @@ def nextFivePrayers(coordinates, timezone, fajrIshaConvention, asrConvention):
 
     :param coordinates: 2-Tuple, (longitude, latitude) of the point of interest in degrees.
     :param timezone: Number, the timezone of the point of interest in hours.
-    :param fajrIshaConvention: String, the angle convention (see dictionary below).
-    :param asrConvention: String, the shadow length multiplier (see dictionary below).
-    :return: OrderedDictionary, mapping prayer names to prayer times (datetime objects).
+    :param fajrIshaConvention: String, the angle convention (see FAJR_ISHA_ANGLE).
+    :param asrConvention: String, the shadow length multiplier (see ASR_SHADOW).
+    :return: Dictionary, mapping prayer names to prayer times (datetime objects).
     """
     NOW = dt.datetime.now()
-    TODAY = dt.datetime(NOW.year, NOW.month, NOW.day)
-    TOMORROW = TODAY + dt.timedelta(days=1)
+    TODAY = dt.datetime.combine(NOW.date(), dt.time.min)
 
-    prayers = OrderedDict()
     args = [coordinates, timezone, fajrIshaConvention, asrConvention]
-
-    prayersToday = computePrayerTimes(TODAY, *args)
-    prayersTomorrow = computePrayerTimes(TOMORROW, *args)
+    prayersToday, prayersTomorrow = computePrayerTimesRange(TODAY, 2, *args)
 
     # Choosing 5 prayers in total: today's remaining prayers + some from tomorrow
     prayersLeftToday = len([t for t in prayersToday.values() if t > NOW])
-    [prayersToday.popitem(last=False) for _ in range(5 - prayersLeftToday)]
-    [prayersTomorrow.popitem(last=True) for _ in range(prayersLeftToday)]
-
-    prayers.update(prayersToday)
-    prayers.update(prayersTomorrow)
-    return prayers
+    prayers = list(prayersToday.items())[5 - prayersLeftToday:]
+    prayers += list(prayersTomorrow.items())[:5 - prayersLeftToday]
+    return dict(prayers)
 
@@ -5,9 +5,11 @@
 
 def setupPaths():
     PATH_SRC = os.path.join(os.path.dirname(__file__), "..", "aroundtheclock")
-    sys.path.append(PATH_SRC)
+    if PATH_SRC not in sys.path:
+        sys.path.append(PATH_SRC)
 
 
 def importFakeRPiModule():
-    sys.modules["RPi"] = MagicMock()
-    sys.modules["RPi.GPIO"] = MagicMock()
+    if "RPi" not in sys.modules:
+        sys.modules["RPi"] = MagicMock()
+        sys.modules["RPi.GPIO"] = MagicMock()
@@ -1,5 +1,7 @@
 import datetime as dt
 
+import pytest
+
 import setup_paths
 setup_paths.setupPaths()
 import algorithms
@@ -14,6 +16,12 @@ def testJulianEquation_standardDate_calculateCorrectly():
     assert JD == algorithms.julianEquation(date)
 
 
+def testJulianEquation_noonOfJ2000_calculateCorrectly():
+    JD = 2451545.0
+    date = dt.datetime(2000, 1, 1, 12)
+    assert JD == algorithms.julianEquation(date)
+
+
 def testSunEquation_standardValue_calculateCorrectly():
     date = dt.datetime(2019, 1, 1)
     DEC = -23.03993184124207
@@ -23,6 +31,26 @@ def testSunEquation_standardValue_calculateCorrectly():
     assert EOT == equationOfTime, "EoT calculations failed!"
 
 
+@pytest.fixture
+def clearSunEquationCache():
+    """
+    Empties the sunEquation cache before and after the test, such that the
+    test neither depends on nor leaks (e.g. mocked) results cached elsewhere.
+    """
+    algorithms.sunEquation.cache_clear()
+    yield
+    algorithms.sunEquation.cache_clear()
+
+
+def testSunEquation_sameDateTwice_computeOnlyOnce(mocker, clearSunEquationCache):
+    date = dt.datetime(1999, 12, 31)
+    mockJulian = mocker.patch("algorithms.julianEquation", return_value=2451543.5)
+    first = algorithms.sunEquation(date)
+    second = algorithms.sunEquation(date)
+    assert first == second
+    assert mockJulian.call_count == 1
+
+
 def testHorizonEquation_standardValue_calculateCorrectly():
     calculated = dt.timedelta(seconds=33298, microseconds=699809)
     ANG = 50.5
@@ -31,9 +59,33 @@ def testHorizonEquation_standardValue_calculateCorrectly():
     assert calculated == algorithms.horizonEquation(ANG, LAT, DEC)
 
 
+def testSpecialiseHorizonAngles_severalAngles_sameAsOneAtATime():
+    ANGS = [18.5, 0.833, 17]
+    LAT = 26.2172
+    DEC = -16.3741
+    calculated = [algorithms.horizonEquation(ANG, LAT, DEC) for ANG in ANGS]
+    hours = algorithms.specialiseHorizonAngles(ANGS)(algorithms.latitudeTrig(LAT), DEC)
+    assert calculated == [dt.timedelta(hours=h) for h in hours]
+
+
 def testAsrEquation_standardValue_calculateCorrectly():
     calculated = dt.timedelta(seconds=14061, microseconds=155471)
     SHA = 2
     LAT = 26.2172
     DEC = -16.3741
     assert calculated == algorithms.asrEquation(SHA, LAT, DEC)
+
+
+def testSpecialiseAsrShadow_standardValue_sameAsAsrEquation():
+    SHA = 2
+    LAT = 26.2172
+    DEC = -16.3741
+    hours = algorithms.specialiseAsrShadow(SHA)(algorithms.latitudeTrig(LAT), DEC)
+    assert algorithms.asrEquation(SHA, LAT, DEC) == dt.timedelta(hours=hours)
+
+
+def testComputeDiff_acrossDays_truncateToWholeSeconds():
+    p1 = dt.datetime(2019, 2, 3, 23, 59, 30, 999999)
+    p2 = dt.datetime(2019, 2, 5, 1, 2, 3)
+    assert algorithms.computeDiff(p1, p2) == (25, 2, 32)
+    assert algorithms.computeDiff(p2, p1) == (25, 2, 32)
@@ -18,29 +18,83 @@ def testOneTimeJobDecorator_scheduledJob_returnCancelJobWhenDone():
 
 
 def testBlockInternet_startBlocking_executeOSCommands(mocker):
-    mockIPRoute = mocker.Mock(name="cmd_route")
-    mockIPRoute.stdout = b"""
-    default via 10.0.2.2 dev enp0s3 proto dhcp metric 100 
-    10.0.2.0/24 dev enp0s3 proto kernel scope link src 10.0.2.15 metric 100 
-    169.254.0.0/16 dev enp0s3 scope link metric 1000 
-    """
-    mockBlock = mocker.Mock(name="cmd_block")
-    mockRun = mocker.patch("subprocess.run", side_effect=[mockIPRoute, mockBlock])
+    routes = (
+        "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+        "enp0s3\t00000000\t0202000A\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+        "enp0s3\t0002000A\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0\n"
+        "enp0s3\t0000FEA9\t00000000\t0001\t0\t0\t1000\t0000FFFF\t0\t0\t0\n"
+    )
+    mockOpen = mocker.patch("block.open", mocker.mock_open(read_data=routes))
+    mockRun = mocker.patch("subprocess.run")
+    mockRun.return_value.returncode = 0
 
     block.blockInternet(10)
 
     # Check if OS functions have been called
     cmdBlock = ["sudo", "aroundtheclock", "enp0s3", "10.0.2.2", "600"]
-    cmdRoute = ["ip", "route"]
-    mockRun.assert_any_call(cmdRoute, stdout=subprocess.PIPE)
-    mockRun.assert_any_call(cmdBlock)
-    assert mockRun.call_count == 2
+    mockOpen.assert_called_once_with(block.PATH_ROUTE, "r")
+    mockRun.assert_called_once_with(cmdBlock, stdout=subprocess.DEVNULL)
 
 
-def testBlockInternet_noIPRouteOutputFromOS_throwOSError(mocker):
-    mockIPRoute = mocker.Mock(name="cmd_route")
-    mockIPRoute.stdout = b""
-    _ = mocker.patch("subprocess.run", return_value=mockIPRoute)
+def testBlockInternet_defaultRouteNotFirst_blockDefaultGateway(mocker):
+    routes = (
+        "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+        "enp0s3\t0002000A\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0\n"
+        "wlan0\t00000000\t0101A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0\n"
+    )
+    _ = mocker.patch("block.open", mocker.mock_open(read_data=routes))
+    mockRun = mocker.patch("subprocess.run")
+    mockRun.return_value.returncode = 0
+
+    block.blockInternet(10)
+
+    cmdBlock = ["sudo", "aroundtheclock", "wlan0", "192.168.1.1", "600"]
+    mockRun.assert_called_once_with(cmdBlock, stdout=subprocess.DEVNULL)
+
+
+def testBlockInternet_zeroDestinationWithMask_skipNonDefaultRoute(mocker):
+    routes = (
+        "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+        "tun0\t00000000\t0100080A\t0003\t0\t0\t0\t00000080\t0\t0\t0\n"
+        "wlan0\t00000000\t0101A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0\n"
+    )
+    _ = mocker.patch("block.open", mocker.mock_open(read_data=routes))
+    mockRun = mocker.patch("subprocess.run")
+    mockRun.return_value.returncode = 0
+
+    block.blockInternet(10)
+
+    cmdBlock = ["sudo", "aroundtheclock", "wlan0", "192.168.1.1", "600"]
+    mockRun.assert_called_once_with(cmdBlock, stdout=subprocess.DEVNULL)
+
+
+def testBlockInternet_blockCommandFails_logError(mocker):
+    routes = (
+        "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+        "enp0s3\t00000000\t0202000A\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+    )
+    _ = mocker.patch("block.open", mocker.mock_open(read_data=routes))
+    mockRun = mocker.patch("subprocess.run")
+    mockRun.return_value.returncode = 1
+    mockError = mocker.patch("block.logging.error")
+    mockInfo = mocker.patch("block.logging.info")
+
+    block.blockInternet(10)
+
+    assert mockError.call_count == 1
+    assert mocker.call("Block time over, unblocking internet now!") not in mockInfo.call_args_list
+
+
+def testBlockInternet_noDefaultRouteFromOS_throwOSError(mocker):
+    routes = "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+    _ = mocker.patch("block.open", mocker.mock_open(read_data=routes))
+
+    with pytest.raises(OSError):
+        block.blockInternet(10)
+
+
+def testBlockInternet_routingTableUnreadable_throwOSError(mocker):
+    _ = mocker.patch("block.open", side_effect=FileNotFoundError)
 
     with pytest.raises(OSError):
         block.blockInternet(10)
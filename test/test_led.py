@@ -1,3 +1,5 @@
+import pytest
+
 import setup_paths
 setup_paths.setupPaths()
 setup_paths.importFakeRPiModule()
@@ -12,3 +14,20 @@ def testBlinkLED_TwelveSecondsDuration_sleepCalledForThreeSeconds(mocker):
     timesCalled = mockSleep.call_count
     assert timesCalled * durationSleep == 12
 
+
+class EndOfTestException(BaseException):
+    """Used in mock objects to halt the endless blinking loop"""
+
+
+def testBlinkContinuously_blinkFails_logAndKeepBlinking(mocker):
+    mockBlink = mocker.patch("led.blinkLED")
+    mockBlink.side_effect = [TypeError, None, EndOfTestException]
+    mockLogging = mocker.patch("led.logging.exception")
+    _ = mocker.patch("led.time.sleep")
+    pin = mocker.MagicMock()
+
+    with pytest.raises(EndOfTestException):
+        led.blinkContinuously(pin, lambda: 3)
+
+    assert mockBlink.call_args_list == [mocker.call(pin, 3)] * 3
+    assert mockLogging.call_count == 1
@@ -28,6 +28,33 @@ def now(cls):
         return cls(2019, 1, 27, 17, 16, 0)
 
 
+######################################## UNIT TESTS
+
+
+@pytest.mark.parametrize("idle, expected", [(-5, 0), (30, 30), (3600, 60)])
+def testComputeSleepDuration_nextJobScheduled_sleepUntilDueAtMostAMinute(mocker, idle, expected):
+    mockSchedule = mocker.patch("main.schedule")
+    mockSchedule.idle_seconds.return_value = idle
+    assert main.computeSleepDuration() == expected
+
+
+def testComputeBlinkSpeed_lastJobCancelledMeanwhile_readNextRunOnce(mocker):
+    mockSchedule = mocker.patch("main.schedule")
+    nextRun = mocker.PropertyMock(side_effect=[dt.datetime.now() + dt.timedelta(hours=2), None])
+    type(mockSchedule.default_scheduler).next_run = nextRun
+
+    assert 1.9 < main.computeBlinkSpeed() <= 2
+    assert nextRun.call_count == 1
+
+
+def testReadConfig_locationAsStrings_coerceToNumbers(tmp_path):
+    path = Path(tmp_path, "config.json")
+    path.write_text('{"longitude": "50.0000", "latitude": "26.6000", "timezone": "5.5"}')
+
+    config = main.readConfig(path)
+    assert (config["longitude"], config["latitude"], config["timezone"]) == (50.0, 26.6, 5.5)
+
+
 ######################################## INTEGRATION TESTS
 
 
@@ -65,15 +92,20 @@ def testMain_createOutputDirectory_OSInvoked(mocker):
     assert mockMkdir.call_count == 1
 
 
-def testMain_scheduleNewPrayerTimes_scheduleAndWait(mocker):
+@pytest.fixture
+def mockDaemon(mocker):
+    """
+    Patches the logging, output directory, LED and scheduler used by main()
+    on a day before any prayer, such that main() schedules a single batch of
+    prayers and then halts by raising EndOfTestException once it attempts to
+    run them.
+
+    :return: 2-Tuple, (mocked schedule module, mocked led module).
+    """
     def branchIfElse(*args, **kwargs):
         mockSchedule.default_scheduler.next_run = dt.datetime(2019, 1, 27, 12)
 
-    times = ["05:05", "11:52", "14:56", "17:17", "18:47"]
-
-    _ = mocker.patch("sys.stdout")
     _ = mocker.patch("logging.getLogger")
-    _ = mocker.patch("main.json.dump")
     _ = mocker.patch("main.Path.mkdir")
     mockLED = mocker.patch("main.led")
 
@@ -83,18 +115,44 @@ def branchIfElse(*args, **kwargs):
     mockSchedule.every.return_value.day.at.return_value.do.side_effect = branchIfElse
 
     main.dt.datetime = MockToday
+    return mockSchedule, mockLED
+
+
+def testMain_scheduleNewPrayerTimes_scheduleAndWait(mocker, mockDaemon):
+    mockSchedule, mockLED = mockDaemon
+    times = ["05:05", "11:52", "14:56", "17:17", "18:47"]
+
+    _ = mocker.patch("sys.stdout")
+    _ = mocker.patch("main.json.dumps", return_value="{}")
 
     # Catching exception as a means to break infinite while loop in source code
     with pytest.raises(EndOfTestException):
         main.main()
 
     # Check if block times have been scheduled
-    [mockSchedule.every.return_value.day.at.assert_any_call(t) for t in times]
+    scheduled = [c[0][0] for c in mockSchedule.every.return_value.day.at.call_args_list]
+    assert scheduled == times
     assert mockSchedule.every.return_value.day.at.return_value.do.call_count == 5
 
-    # Check if LED blinked
-    assert mockLED.blinkLED.call_count == 1
+    # Check if LED started blinking
+    assert mockLED.startBlinking.call_count == 1
 
     # Check if scheduled jobs attempted to be executed
     assert mockSchedule.run_pending.call_count == 1
 
+
+def testMain_prayerWithinCurrentMinute_skipScheduling(mocker, mockDaemon):
+    mockSchedule, _ = mockDaemon
+    prayers = {
+        "maghrib": dt.datetime(2019, 1, 27, 0, 0, 40),
+        "isha": dt.datetime(2019, 1, 27, 1, 30, 40),
+    }
+
+    _ = mocker.patch("main.writePrayerTimes")
+    _ = mocker.patch("main.printPrayerTimes")
+    _ = mocker.patch("main.nextFivePrayers", return_value=prayers)
+
+    with pytest.raises(EndOfTestException):
+        main.main()
+
+    mockSchedule.every.return_value.day.at.assert_called_once_with("01:30")
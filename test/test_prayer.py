@@ -1,5 +1,4 @@
 import datetime as dt
-from collections import OrderedDict
 
 import pytest
 
@@ -10,8 +9,6 @@
 
 ######################################## HELPER FUNCTIONS
 
-FORMAT = "%Y-%m-%d %H:%M"
-
 
 def formatPrayers(prayers):
     """
@@ -35,6 +32,18 @@ def formatPrayers(prayers):
     return ["{} {}".format(d, prayer) for prayer in ps]
 
 
+def parseDatetime(s):
+    """
+    Parses a datetime written in the format used by the test data, that is
+    "YYYY-MM-DD HH:MM". Slicing the fixed width fields is much cheaper than
+    strptime, which interprets its format string on every call.
+
+    :param s: String, the datetime to parse, e.g. "2019-01-27 05:05".
+    :return: datetime.datetime, the parsed datetime.
+    """
+    return dt.datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]))
+
+
 def assertAlmostEqualPrayer(p1, p2, err):
     """
     Tests whether the two prayer times are almost equal by checking whether
@@ -45,8 +54,8 @@ def assertAlmostEqualPrayer(p1, p2, err):
     :param err: Integer, the number of minutes the prayer can deviate.
     :return: Boolean, true if prayer is in time tolerance otherwise false.
     """
-    hours, minutes, seconds = algorithms.computeDiff(p1, p2)
-    if abs(60*hours + minutes + seconds/60) > err:
+    if int(abs(p1 - p2).total_seconds()) > 60*err:
+        hours, minutes, seconds = algorithms.computeDiff(p1, p2)
         pytest.fail("Prayer time differs by {:02d}:{:02d}:{:02d}!\np1: {}\np2: {}"
                     .format(hours, minutes, seconds, p1, p2))
 
@@ -60,7 +69,8 @@ def now(cls):
 ######################################## TEST DATA (KHOBAR)
 
 
-mosqueTimings = map(formatPrayers, [
+# Parsed once at import rather than in every parametrised test
+mosqueTimings = tuple(tuple(map(parseDatetime, formatPrayers(t))) for t in [
     ["2019-01-27", "05:06", "11:53", "14:58", "17:19", "18:49"],
     ["2019-02-07", "05:00", "11:54", "15:05", "17:28", "18:58"],
     ["2019-02-10", "04:59", "11:54", "15:06", "17:29", "18:59"],
@@ -71,13 +81,13 @@ def now(cls):
 
 @pytest.fixture
 def kPrayers():
-    prayers = OrderedDict({
-        "fajr": dt.datetime.strptime("2019-02-04 05:01", FORMAT),
-        "thuhr": dt.datetime.strptime("2019-02-04 11:53", FORMAT),
-        "asr": dt.datetime.strptime("2019-02-04 15:02", FORMAT),
-        "maghrib": dt.datetime.strptime("2019-02-04 17:26", FORMAT),
-        "isha": dt.datetime.strptime("2019-02-04 18:29", FORMAT),
-    })
+    prayers = {
+        "fajr": parseDatetime("2019-02-04 05:01"),
+        "thuhr": parseDatetime("2019-02-04 11:53"),
+        "asr": parseDatetime("2019-02-04 15:02"),
+        "maghrib": parseDatetime("2019-02-04 17:26"),
+        "isha": parseDatetime("2019-02-04 18:29"),
+    }
     return prayers
 
 
@@ -110,6 +120,11 @@ def testFormatPrayers_commonCase_mergeDateWithTime():
     assert formatPrayers(inp) == exp
 
 
+def testParseDatetime_commonCase_matchStrptime():
+    s = "2019-01-27 05:05"
+    assert parseDatetime(s) == dt.datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
 def testComputeFajr_khobarCity_calculateKhobarFajr(kPrayers, kParams):
     date = dt.datetime(2019, 2, 4)
     p = prayer.computeFajr(date, kParams["F_ANG"], kParams["LAT"], kPrayers["thuhr"])
@@ -135,8 +150,8 @@ def testComputeMaghrib_khobarCity_calculateKhobarMaghrib(kPrayers, kParams):
 
 
 def testComputeIshaUmmAlQura_khobarCity_return90MinuteFromMaghrib():
-    isha = dt.datetime.strptime("2019-02-04 18:56", FORMAT)
-    maghrib = dt.datetime.strptime("2019-02-04 17:26", FORMAT)
+    isha = parseDatetime("2019-02-04 18:56")
+    maghrib = parseDatetime("2019-02-04 17:26")
     p = prayer.computeIshaUmmAlQura(maghrib)
     assertAlmostEqualPrayer(p, isha, 0)   # No error acceptable
 
@@ -147,10 +162,9 @@ def testComputeIsha_khobarCity_calculateKhobarIsha(kPrayers, kParams):
     assertAlmostEqualPrayer(p, kPrayers["isha"], 3)
 
 
-@pytest.mark.parametrize("timings", [t for t in mosqueTimings])
+@pytest.mark.parametrize("timings", mosqueTimings)
 def testComputePrayerTimes_khobarCity_calculatePrecisely(timings, kParams):
-    timings = [dt.datetime.strptime(t, FORMAT) for t in timings]
-    date = dt.datetime(timings[0].year, timings[0].month, timings[0].day)
+    date = dt.datetime.combine(timings[0].date(), dt.time.min)
 
     prayers = prayer.computePrayerTimes(date,
                                         (kParams["LON"], kParams["LAT"]),
@@ -162,6 +176,72 @@ def testComputePrayerTimes_khobarCity_calculatePrecisely(timings, kParams):
         assertAlmostEqualPrayer(p1, p2, 2)
 
 
+@pytest.mark.parametrize("fajrIshaConvention", ["umm_alqura", "isna"])
+def testComputePrayerTimes_khobarCity_matchPerPrayerFunctions(fajrIshaConvention, kParams):
+    date = dt.datetime(2019, 2, 4)
+    F_ANG, I_ANG = prayer.FAJR_ISHA_ANGLE[fajrIshaConvention]
+
+    prayers = prayer.computePrayerTimes(date,
+                                        (kParams["LON"], kParams["LAT"]),
+                                        kParams["TZ"],
+                                        fajrIshaConvention,
+                                        kParams["A"])
+
+    thuhr = prayer.computeThuhr(date, kParams["LON"], kParams["TZ"])
+    maghrib = prayer.computeMaghrib(date, kParams["LAT"], thuhr)
+    if I_ANG == "90min":
+        isha = prayer.computeIshaUmmAlQura(maghrib)
+    else:
+        isha = prayer.computeIsha(date, I_ANG, kParams["LAT"], thuhr)
+    expected = [prayer.computeFajr(date, F_ANG, kParams["LAT"], thuhr),
+                thuhr,
+                prayer.computeAsr(date, kParams["SHA"], kParams["LAT"], thuhr),
+                maghrib,
+                isha]
+
+    for p1, p2 in zip(prayers.values(), expected):
+        assertAlmostEqualPrayer(p1, p2, 0)
+
+
+def testSpecialisePrayerTimes_khobarCity_matchComputePrayerTimes(kParams):
+    date = dt.datetime(2019, 2, 4)
+    args = [(kParams["LON"], kParams["LAT"]), kParams["TZ"], kParams["FI"], kParams["A"]]
+
+    prayerTimes = prayer.specialisePrayerTimes(*args)
+    assert prayerTimes(date) == prayer.computePrayerTimes(date, *args)
+
+
+def testComputePrayerTimesRange_threeDays_matchComputePrayerTimesPerDay(kParams):
+    date = dt.datetime(2019, 2, 4)
+    args = [(kParams["LON"], kParams["LAT"]), kParams["TZ"], kParams["FI"], kParams["A"]]
+
+    days = prayer.computePrayerTimesRange(date, 3, *args)
+    assert days == [prayer.computePrayerTimes(date + dt.timedelta(days=i), *args) for i in range(3)]
+
+
+def testGuessCoordinates_khobarCity_guessNearKhobar(kParams):
+    date = dt.datetime(2019, 2, 4)
+    args = [kParams["TZ"], kParams["FI"], kParams["A"]]
+    prayers = prayer.computePrayerTimes(date, (kParams["LON"], kParams["LAT"]), *args)
+
+    longitude, latitude, err = prayer.guessCoordinates(list(prayers.values()),
+                                                       [49.9, 50.1], [26.5, 26.7],
+                                                       date, *args, guesses=500, seed=0)
+    assert abs(longitude - kParams["LON"]) < 0.05
+    assert abs(latitude - kParams["LAT"]) < 0.1
+    assert err < 1
+
+
+def testGuessCoordinates_sameSeed_sameGuess(kParams):
+    date = dt.datetime(2019, 2, 4)
+    args = [kParams["TZ"], kParams["FI"], kParams["A"]]
+    prayers = list(prayer.computePrayerTimes(date, (kParams["LON"], kParams["LAT"]), *args).values())
+
+    guesses = [prayer.guessCoordinates(prayers, [49, 51], [25.6, 27.6], date, *args,
+                                       guesses=50, seed=7) for _ in range(2)]
+    assert guesses[0] == guesses[1]
+
+
 def testNextFivePrayers_khobarCity_calculatePrecisely(kParams):
     timings = [
         "2019-01-27 17:19",
@@ -170,7 +250,7 @@ def testNextFivePrayers_khobarCity_calculatePrecisely(kParams):
         "2019-01-28 11:53",
         "2019-01-28 14:57"
     ]
-    timings = [dt.datetime.strptime(t, FORMAT) for t in timings]
+    timings = [parseDatetime(t) for t in timings]
 
     prayer.dt.datetime = MockBeforeMaghrib
     prayers = prayer.nextFivePrayers((kParams["LON"], kParams["LAT"]),
@@ -187,9 +267,10 @@ def testWritePrayerTimes_writeToFile_writeCalledProperly(mocker, kPrayers):
     mockOpen = mocker.mock_open()
     _ = mocker.patch("prayer.open", mockOpen)
     mockJSON = mocker.patch("prayer.json")
-    unordered = {k: v.strftime("%H:%M") for k, v in kPrayers.items()}
-    out = OrderedDict({p: unordered[p] for p in PRAYERS})
+    out = {k: v.strftime("%H:%M") for k, v in kPrayers.items()}
 
     prayer.writePrayerTimes(kPrayers, mocker.MagicMock())
-    mockJSON.dump.assert_called_with(out, mockOpen(), **{"indent": 4})
+    mockJSON.dumps.assert_called_with(out, **{"indent": 4})
+    assert list(mockJSON.dumps.call_args[0][0]) == PRAYERS
+    mockOpen().write.assert_called_once_with(mockJSON.dumps.return_value)
 